@@ -1,3 +1,4 @@
+import asyncio
 import functools
 import inspect
 import logging
@@ -5,46 +6,109 @@ import os
 import sys
 import threading
 import types
+import weakref
 
 from .live import get_watch_instance
+from .utils import cached_abspath
 
 ## Debugger to use
 if "pydevd" in sys.modules:
     # Handles VSCode, probably others
+    import pydevd # type: ignore
+
     DEBUGGER = "pydevd"
     # Fake the path of generated sources to match the original source
     DEBUG_ORIGINAL_PATH_FOR_RELOADED_CODE = True
 elif "pudb" in sys.modules:
+    import pudb # type: ignore
+
     DEBUGGER = "pudb"
     DEBUG_ORIGINAL_PATH_FOR_RELOADED_CODE = True
 else:
     # Default stdlib wrapper
+    import pdb
+
     DEBUGGER = "pdb"
     # Show the generated "surrogate" source in the debugger
     DEBUG_ORIGINAL_PATH_FOR_RELOADED_CODE = False
 
-HOT_RESTART_ALREADY_WRAPPED = "_hot_restart_already_wrapped"
+# Whether a pdb post-mortem session can actually attach
+_interactive = sys.stdin is not None and sys.stdin.isatty()
+
 HOT_RESTART_NO_WRAP = "_hot_restart_no_wrap"
 
+# Functions that have already been wrapped (either the wrapper itself or
+# an input passed to hot_restart_wrap twice). A WeakSet sentinel avoids
+# creating a __dict__ on every wrapped function and works for C-level
+# callables that forbid attribute assignment.
+_wrapped = weakref.WeakSet()
+
+def _is_wrapped(obj):
+    try:
+        return obj in _wrapped
+    except TypeError:
+        # Unhashable objects (e.g. dataclass instances with eq=True)
+        # cannot be in the set
+        return False
+
+# Per-thread restart state. Set
+# jurigged.hot_restart_utils._tls.exit_this_frame = True from the
+# debugger to exit the restart loop of the current thread.
+_tls = threading.local()
+
 log = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=None)
+def _cached_module_path(mod_name):
+    mod = sys.modules.get(mod_name)
+    path = getattr(mod, "__file__", None)
+    # Convert to absolute path if needed
+    if path is not None and not os.path.isabs(path):
+        path = cached_abspath(path)
+    return path
+
+# Number of entries in sys.modules the last time the cache was validated
+_modules_count = 0
+
+def _validate_module_path_cache():
+    """Clear the module path cache if sys.modules membership changed."""
+    global _modules_count
+    count = len(sys.modules)
+    if count != _modules_count:
+        _modules_count = count
+        _cached_module_path.cache_clear()
+
 def get_module_file_path(func):
     # Dynamically get the file path of the module
+    mod_name = getattr(func, "__module__", None)
     module_file_path = None
-    try:
-        module = inspect.getmodule(func)
-        module_file_path = inspect.getfile(module)
-        # Convert to absolute path if needed
-        if not os.path.isabs(module_file_path):
-            module_file_path = os.path.abspath(module_file_path)
-        log.debug(f"Module {module.__name__!r} file path: {module_file_path}")
-    except (TypeError, ValueError) as e:
+    if mod_name is not None:
+        module_file_path = _cached_module_path(mod_name)
+    if module_file_path is None:
+        module_file_path = getattr(
+            getattr(func, "__code__", None), "co_filename", None
+        )
+        if module_file_path is not None and not os.path.isabs(module_file_path):
+            module_file_path = cached_abspath(module_file_path)
+    if module_file_path is None:
         # This can happen for built-in modules
-        log.debug(f"Could not determine file path for module {module.__name__!r}: {e}")
+        log.debug("Could not determine file path for module %r", mod_name)
+        return None
+    log.debug("Module %r file path: %s", mod_name, module_file_path)
     return module_file_path
     
+def _is_coroutine_function(func):
+    # Test CO_COROUTINE on the code object directly; much cheaper than the
+    # pure-Python dispatch in inspect.iscoroutinefunction.
+    code = getattr(func, "__code__", None)
+    if code is None:
+        # No code object (builtins, partials, ...): use the slow path
+        return inspect.iscoroutinefunction(func)
+    return bool(code.co_flags & inspect.CO_COROUTINE)
+
 def wrap_module(module_or_name=None):
     """Wrap all eligible functions in a module to enable hot reloading."""
+    _validate_module_path_cache()
     if module_or_name is None:
         # Need to go get module of calling frame
         module_or_name = sys._getframe(1).f_globals["__name__"]
@@ -58,47 +122,64 @@ def wrap_module(module_or_name=None):
         module_name = module.__name__
         module_d = module.__dict__
         
-    log.debug(f"Wrapping module {module_name!r}")
+    log.debug("Wrapping module %r", module_name)
     
     out_d = {}
-    for k, v in list(module_d.items()):
+    # Snapshot only the keys; avoids copying the whole (key, value) item
+    # list while still tolerating concurrent mutation of the module dict.
+    for k in tuple(module_d):
+        v = module_d.get(k)
+        if v is None:
+            continue
         if getattr(v, HOT_RESTART_NO_WRAP, False):
-            log.warn(f"Skipping wrapping of no_wrap {v!r}")
-        elif getattr(v, HOT_RESTART_ALREADY_WRAPPED, False):
-            log.warn(f"Skipping already wrapped {v!r}")
+            log.warning("Skipping wrapping of no_wrap %r", v)
+        elif _is_wrapped(v):
+            log.warning("Skipping already wrapped %r", v)
         elif inspect.isclass(v):
-            v_module = inspect.getmodule(v)
-            
-            if v_module and v_module.__name__ == module_name:
-                
-                log.debug(f"Wrapping class {v!r}")
+            v_mod_name = getattr(v, "__module__", None)
+
+            if v_mod_name == module_name:
+
+                log.debug("Wrapping class %r", v)
                 hot_restart_wrap_class(v)
             else:
                 log.debug(
-                    f"Not wrapping in-scope class {v!r} since it originates from {v_module} != {module_name}"
+                    "Not wrapping in-scope class %r since it originates from %s != %s",
+                    v,
+                    v_mod_name,
+                    module_name,
                 )
         elif callable(v):
-            v_module = inspect.getmodule(v)
-            if v_module and v_module.__name__ == module_name:
-                
-                log.debug(f"Wrapping callable {v!r}")
+            v_mod_name = getattr(v, "__module__", None)
+            if v_mod_name == module_name:
+
+                log.debug("Wrapping callable %r", v)
                 out_d[k] = hot_restart_wrap(v)
             else:
                 log.debug(
-                    f"Not wrapping in-scope callable {v!r} since it originates from {v_module} != {module_name}"
+                    "Not wrapping in-scope callable %r since it originates from %s != %s",
+                    v,
+                    v_mod_name,
+                    module_name,
                 )
         else:
-            log.debug(f"Not wrapping {v!r}")
+            log.debug("Not wrapping %r", v)
     for k, v in out_d.items():
         module_d[k] = v
         
 def hot_restart_wrap_class(cls):
     """Wrap all methods in a class to enable hot reloading."""
-    log.debug(f"Wrapping class: {cls!r}")
+    log.debug("Wrapping class: %r", cls)
     for k, v in list(vars(cls).items()):
-        if callable(v):
-            log.debug(f"Wrapping {cls!r}.{k}")
+        if k.startswith("__"):
+            continue
+        if isinstance(v, types.FunctionType):
+            log.debug("Wrapping %r.%s", cls, k)
             setattr(cls, k, hot_restart_wrap(v))
+        elif isinstance(v, (classmethod, staticmethod)):
+            # Wrap the underlying function and rebuild the descriptor
+            log.debug("Wrapping %r.%s", cls, k)
+            setattr(cls, k, type(v)(hot_restart_wrap(v.__func__)))
             
 def hot_restart_wrap(
     func=None,
@@ -107,7 +188,7 @@ def hot_restart_wrap(
     propagate_keyboard_interrupt: bool = True,
 ):
     """Wrap a function to enable hot reloading on exception."""
-    if inspect.isclass(func):
+    if isinstance(func, type):
         raise ValueError("Use wrap_class to wrap a class")
     assert isinstance(
         propagated_exceptions, tuple
@@ -118,88 +199,116 @@ def hot_restart_wrap(
             propagated_exceptions=propagated_exceptions,
             propagate_keyboard_interrupt=propagate_keyboard_interrupt,
         )
-    if getattr(func, HOT_RESTART_ALREADY_WRAPPED, False):
-        log.debug(f"Already wrapped {func!r}, not wrapping again")
+    if _is_wrapped(func):
+        log.debug("Already wrapped %r, not wrapping again", func)
         return func
-    log.debug(f"Wrapping {func!r}")
-    
-    if inspect.iscoroutinefunction(func):
-        module_file_path = get_module_file_path(func)
-        
+    log.debug("Wrapping %r", func)
+
+    # Merge everything that should propagate into one tuple at wrap time
+    # so the handler does a single isinstance check per exception.
+    # SystemExit, GeneratorExit and CancelledError always propagate, as
+    # they did when the wrappers caught Exception only; catching
+    # BaseException is what makes propagate_keyboard_interrupt effective
+    # at all, but it must not swallow task cancellation.
+    propagate = propagated_exceptions + (
+        SystemExit,
+        GeneratorExit,
+        asyncio.CancelledError,
+    )
+    if propagate_keyboard_interrupt:
+        propagate += (KeyboardInterrupt,)
+
+    module_file_path = get_module_file_path(func)
+
+    if _is_coroutine_function(func):
+
         @functools.wraps(func)
         async def wrapped_async(*args, **kwargs):
-            watch_instance = get_watch_instance()
-            global EXIT_THIS_FRAME
-            EXIT_THIS_FRAME = False
-            restart_count = 0
-            while not EXIT_THIS_FRAME:
-                if restart_count > 0:
-                    log.debug("Restarting wraped async module")
+            # Fast path: a successful call does no loop bookkeeping
+            try:
+                return await func(*args, **kwargs)
+            except BaseException as e:
+                _tls.exit_this_frame = False
+                _handle_wrapped_exception(
+                    module_file_path,
+                    e,
+                    propagate,
+                    wrapped_async,
+                )
+            while not getattr(_tls, "exit_this_frame", False):
                 try:
-                    result = await func(*args, **kwargs)
-                    return result
-                except Exception as e:
-                    if isinstance(e, propagated_exceptions):
-                        raise e
-                    if propagate_keyboard_interrupt and isinstance(e, KeyboardInterrupt):
-                        raise e
-                    
-                    # Handle exception with debugger
-                    excinfo = sys.exc_info()
-                    new_tb, num_dead_frames = _create_undead_traceback(
-                        excinfo[2], sys._getframe(1), wrapped_async
+                    return await func(*args, **kwargs)
+                except BaseException as e:
+                    _handle_wrapped_exception(
+                        module_file_path,
+                        e,
+                        propagate,
+                        wrapped_async,
                     )
-                    excinfo = (excinfo[0], excinfo[1], new_tb)
-                
-                    # Start post-mortem debugging
-                    _start_post_mortem(module_file_path, excinfo, num_dead_frames)
-                
-                    # After debugging, refresh the code
-                    watch_instance.refresh(module_file_path)
-                    
-                restart_count += 1
-                
-        setattr(wrapped_async, HOT_RESTART_ALREADY_WRAPPED, True)
+
+        _wrapped.add(wrapped_async)
         return wrapped_async
-                
+
     else:
-        module_file_path = get_module_file_path(func)
-        
+
         @functools.wraps(func)
         def wrapped(*args, **kwargs):
-            watch_instance = get_watch_instance()
-            global EXIT_THIS_FRAME
-            EXIT_THIS_FRAME = False
-            restart_count = 0
-            while not EXIT_THIS_FRAME:
-                if restart_count > 0:
-                    log.debug("Restarting wraped module")
+            # Fast path: a successful call does no loop bookkeeping
+            try:
+                return func(*args, **kwargs)
+            except BaseException as e:
+                _tls.exit_this_frame = False
+                _handle_wrapped_exception(
+                    module_file_path,
+                    e,
+                    propagate,
+                    wrapped,
+                )
+            while not getattr(_tls, "exit_this_frame", False):
                 try:
-                    result = func(*args, **kwargs)
-                    return result
-                except Exception as e:
-                    if isinstance(e, propagated_exceptions):
-                        raise e
-                    if propagate_keyboard_interrupt and isinstance(e, KeyboardInterrupt):
-                        raise e
-                    
-                    # Handle exception with debugger
-                    excinfo = sys.exc_info()
-                    new_tb, num_dead_frames = _create_undead_traceback(
-                        excinfo[2], sys._getframe(1), wrapped_async
+                    return func(*args, **kwargs)
+                except BaseException as e:
+                    _handle_wrapped_exception(
+                        module_file_path,
+                        e,
+                        propagate,
+                        wrapped,
                     )
-                    excinfo = (excinfo[0], excinfo[1], new_tb)
-                
-                    # Start post-mortem debugging
-                    _start_post_mortem(module_file_path, excinfo, num_dead_frames)
-                
-                    # After debugging, refresh the code
-                    watch_instance.refresh(module_file_path)
-                    
-                restart_count += 1
-        setattr(wrapped, HOT_RESTART_ALREADY_WRAPPED, True)
+        _wrapped.add(wrapped)
         return wrapped
 
+def _handle_wrapped_exception(
+    module_file_path,
+    e,
+    propagate,
+    wrapper_fn,
+):
+    """Propagate or debug an exception raised by a wrapped function."""
+    if isinstance(e, propagate):
+        raise e
+    if not _interactive and DEBUGGER == "pdb":
+        # No debugger can attach; skip the traceback rebuild
+        raise e
+
+    # Handle exception with debugger
+    excinfo = sys.exc_info()
+    if DEBUGGER == "pydevd":
+        # pydevd reconstructs its own stack
+        new_tb, num_dead_frames = excinfo[2], 0
+    else:
+        # _getframe(2): the frame that called the wrapper
+        new_tb, num_dead_frames = _create_undead_traceback(
+            excinfo[2], sys._getframe(2), wrapper_fn
+        )
+    excinfo = (excinfo[0], excinfo[1], new_tb)
+
+    # Start post-mortem debugging
+    _start_post_mortem(module_file_path, excinfo, num_dead_frames)
+
+    # After debugging, refresh the code
+    get_watch_instance().refresh(module_file_path)
+    log.debug("Restarting wrapped function %r", wrapper_fn)
+
 def _create_undead_traceback(exc_tb, current_frame, wrapper_function):
     """Create a new traceback object that includes the current frame's parents."""
     # We want to default to one frame below the last one (the frame of the wrapper)
@@ -232,43 +341,27 @@ def _create_undead_traceback(exc_tb, current_frame, wrapper_function):
     return prev_tb, num_dead_frames
 def _start_post_mortem(func_path, excinfo, num_dead_frames):
     """Start post-mortem debugging based on the configured debugger."""
-    if DEBUGGER == "pdb":
-        _start_pdb_post_mortem(func_path, excinfo, num_dead_frames)
-    elif DEBUGGER == "pydevd":
-        _start_pydevd_post_mortem(func_path, excinfo)
-    elif DEBUGGER == "pudb":
-        _start_pudb_post_mortem(func_path, excinfo)
-    else:
-        log.debug(f"Unknown debugger {DEBUGGER}, falling back to breakpoint()")
-        breakpoint()
-        
+    _POST_MORTEM_FN(func_path, excinfo, num_dead_frames)
+
 def _start_pdb_post_mortem(func_path, excinfo, num_dead_frames):
     """Start post-mortem debugging with pdb."""
-    import pdb
-    
     e_type, e, tb = excinfo
-    log.debug(f"Entering pdb debugging of {func_path}")
-    
+    log.debug("Entering pdb debugging of %s", func_path)
+
     # Create a custom pdb instance
     p = pdb.Pdb()
     p.reset()
     p.interaction(None, tb)
-        
-def _start_pudb_post_mortem(func_path, excinfo):
+
+def _start_pudb_post_mortem(func_path, excinfo, num_dead_frames):
     """Start post-mortem debugging with pudb."""
     e_type, e, tb = excinfo
-    log.debug(f"Entering pudb debugging of {func_path}")
-    import pudb # type: ignore
+    log.debug("Entering pudb debugging of %s", func_path)
     pudb.post_mortem(tb=tb, e_type=e_type, e_value=e)
-def _start_pydevd_post_mortem(func_path, excinfo):
+def _start_pydevd_post_mortem(func_path, excinfo, num_dead_frames):
     """Start post-mortem debugging with pydevd (VSCode)."""
     print(f"jurigged: Continue to revive {func_path}", file=sys.stderr)
-    
-    try:
-        import pydevd # type: ignore
-    except ImportError:
-        breakpoint()
-        return
+
     py_db = pydevd.get_global_debugger()
     if py_db is None:
         breakpoint()
@@ -279,4 +372,12 @@ def _start_pydevd_post_mortem(func_path, excinfo):
         try:
             py_db.stop_on_unhandled_exception(py_db, thread, additional_info, excinfo)
         finally:
-            additional_info.is_tracing -= 1
\ No newline at end of file
+            additional_info.is_tracing -= 1
+
+# Resolve the post-mortem entry point once; avoids string-comparing
+# DEBUGGER on every exception
+_POST_MORTEM_FN = {
+    "pdb": _start_pdb_post_mortem,
+    "pudb": _start_pudb_post_mortem,
+    "pydevd": _start_pydevd_post_mortem,
+}[DEBUGGER]
\ No newline at end of file
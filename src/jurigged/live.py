@@ -2,11 +2,13 @@ import argparse
 import ast
 import code
 import functools
+import hashlib
 import importlib
 import logging
 import os
 import sys
 import threading
+import time
 import traceback
 from dataclasses import dataclass
 from types import ModuleType
@@ -15,14 +17,13 @@ import inspect
 from typing import Any, Optional
 
 import blessed
-from ovld import ovld
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 from watchdog.observers.polling import PollingObserverVFS
 
 from . import codetools, runpy
 from .register import registry
-from .utils import EventSource, glob_filter, or_filter
+from .utils import EventSource, cached_normpath, glob_filter, or_filter
 from .version import version
 
 log = logging.getLogger(__name__)
@@ -43,44 +44,75 @@ class WatchOperation:
         return f"Watch {self.filename}"
 
 
-@ovld
-def default_logger(event: codetools.UpdateOperation):
+def _log_update(event):
     if isinstance(event.defn, codetools.FunctionDefinition):
         print(T.bold_yellow(str(event)))
 
 
-@ovld
-def default_logger(event: codetools.AddOperation):
+def _log_add(event):
     print(T.bold_green(str(event)))
 
 
-@ovld
-def default_logger(event: codetools.DeleteOperation):
+def _log_delete(event):
     print(T.bold_red(str(event)))
 
 
-@ovld
-def default_logger(event: WatchOperation):
+def _log_watch(event):
     print(T.bold(str(event)))
 
 
-@ovld
-def default_logger(exc: Exception):
-    lines = traceback.format_exception(type(exc), exc, exc.__traceback__)
-    print(T.bold_red("".join(lines)))
+# Formatted tracebacks, keyed on (exception id, limit). Exception floods
+# (e.g. a broken file reimported on every refresh) log the same few
+# exception objects over and over; formatting them once is enough. The
+# cached value holds the exception itself, both to keep the id stable
+# while cached and to verify identity on a hit so a recycled id can
+# never serve stale text. Kept tiny and evicted wholesale.
+_formatted_tb_cache: dict = {}
 
 
-@ovld
-def default_logger(exc: SyntaxError):
-    lines = traceback.format_exception(
-        type(exc), exc, exc.__traceback__, limit=0
+def _format_exception(exc, limit=None):
+    key = (id(exc), limit)
+    entry = _formatted_tb_cache.get(key)
+    if entry is not None and entry[0] is exc:
+        return entry[1]
+    formatted = "".join(
+        traceback.format_exception(type(exc), exc, exc.__traceback__, limit=limit)
     )
-    print(T.bold_red("".join(lines)))
+    if len(_formatted_tb_cache) >= 32:
+        _formatted_tb_cache.clear()
+    _formatted_tb_cache[key] = (exc, formatted)
+    return formatted
 
 
-@ovld
-def default_logger(event: object):
-    print(event)
+def _log_exception(exc):
+    print(T.bold_red(_format_exception(exc)))
+
+
+def _log_syntax_error(exc):
+    print(T.bold_red(_format_exception(exc, limit=0)))
+
+
+# There are only a handful of event types, so a direct type -> handler
+# lookup beats MRO-walking dispatch during bulk refreshes
+_LOGGERS = {
+    codetools.UpdateOperation: _log_update,
+    codetools.AddOperation: _log_add,
+    codetools.DeleteOperation: _log_delete,
+    WatchOperation: _log_watch,
+    SyntaxError: _log_syntax_error,
+}
+
+
+def default_logger(event):
+    handler = _LOGGERS.get(type(event))
+    if handler is not None:
+        handler(event)
+    elif isinstance(event, SyntaxError):
+        _log_syntax_error(event)
+    elif isinstance(event, Exception):
+        _log_exception(event)
+    else:
+        print(event)
 
 
 def conservative_logger(event):
@@ -91,28 +123,110 @@ def conservative_logger(event):
 class Watcher:
     def __init__(self, registry, debounce=DEFAULT_DEBOUNCE, poll=False):
         
+        # Stat results memoized for the duration of a polling sweep
+        self._stat_cache: dict[str, tuple[float, os.stat_result]] = {}
         if poll:
+            self.poll_interval = poll
             self.observer = PollingObserverVFS(
-                stat=os.stat, listdir=os.scandir, polling_interval=poll
+                stat=self._cached_stat,
+                listdir=os.scandir,
+                polling_interval=poll,
             )
         else:
             self.observer = Observer()
-            
+
         self.registry = registry
         self.registry.precache_activity.register(self.on_prepare)
         self.debounce = debounce
         self.poll = poll
         self.prerun = EventSource()
         self.postrun = EventSource()
-    
+        # Files whose refresh is pending on the shared debounce timer
+        self._pending: set[str] = set()
+        self._pending_lock = threading.Lock()
+        self._pending_timer: Optional[threading.Timer] = None
+        # One handler per watched directory
+        self._handlers: dict[str, JuriggedHandler] = {}
+        # Content digest of each file the last time it was refreshed
+        self._digests: dict[str, bytes] = {}
+
 
     def on_prepare(self, module_name, filename):
         """Register a file to be watched."""
-        JuriggedHandler(self, filename).schedule(self.observer)
+        directory = os.path.dirname(filename)
+        handler = self._handlers.get(directory)
+        if handler is None:
+            handler = self._handlers[directory] = JuriggedHandler(
+                self, directory
+            )
+            handler.schedule(self.observer)
+        handler.add_file(filename)
         self.registry.log(WatchOperation(filename))
         
+    def _cached_stat(self, path):
+        """Stat a path, serving duplicates from a short-lived cache.
+
+        Entries are only reused within half a polling interval, so
+        change detection across sweeps is unaffected; overlapping
+        watches statting the same path in one sweep share the syscall.
+        """
+        now = time.monotonic()
+        entry = self._stat_cache.get(path)
+        if entry is not None and now - entry[0] < self.poll_interval / 2:
+            return entry[1]
+        result = os.stat(path)
+        self._stat_cache[path] = (now, result)
+        return result
+
+    def enqueue(self, path):
+        """Schedule a refresh of a file, coalescing bursts of events.
+
+        A single timer is shared by all watched files so that bulk
+        modifications (e.g. a git checkout) do not spawn one thread per
+        file.
+        """
+        if not self.debounce:
+            self.refresh(path)
+            return
+        with self._pending_lock:
+            self._pending.add(path)
+            if self._pending_timer is not None:
+                self._pending_timer.cancel()
+            self._pending_timer = threading.Timer(
+                self.debounce, self._refresh_pending
+            )
+            self._pending_timer.start()
+
+    def _refresh_pending(self):
+        with self._pending_lock:
+            pending = list(self._pending)
+            self._pending.clear()
+            self._pending_timer = None
+        self._stat_cache.clear()
+        for path in pending:
+            self.refresh(path)
+
+    def _content_changed(self, path):
+        # Editors frequently rewrite files with identical content
+        # (autosave, format-on-save with no diff); hashing is much
+        # cheaper than reparsing the file.
+        try:
+            with open(path, "rb") as f:
+                digest = hashlib.blake2b(f.read(), digest_size=16).digest()
+        except (OSError, TypeError):
+            # TypeError: refresh(None) is reachable when a wrapped
+            # callable has no resolvable file; let the registry miss
+            # handle it gracefully
+            return True
+        if self._digests.get(path) == digest:
+            return False
+        self._digests[path] = digest
+        return True
+
     def refresh(self, path):
         """Refresh a file or module."""
+        if not self._content_changed(path):
+            return
         cf = self.registry.get(path)
         if cf:
             try:
@@ -139,33 +253,24 @@ class Watcher:
 
 
 class JuriggedHandler(FileSystemEventHandler):
-    def __init__(self, watcher, filename):
+    def __init__(self, watcher, directory):
         self.watcher = watcher
-        self.filename = filename
-        self.normalized_filename = os.path.normpath(filename)
-        self.mtime = 0
-        self.timer = None
+        self.directory = directory
+        # Maps the normalized path of each watched file to the path it
+        # was registered under
+        self.filenames: dict[str, str] = {}
 
-    def _refresh(self):
-        self.watcher.refresh(self.filename)
-        self.timer = None
+    def add_file(self, filename):
+        self.filenames[cached_normpath(filename)] = filename
 
     def on_modified(self, event):
-        if event.src_path == self.normalized_filename:
-            mtime = os.path.getmtime(event.src_path)
-            # The modified event sometimes fires twice for no reason
-            # even though the mtime is the same
-            if mtime != self.mtime:
-                self.mtime = mtime
-                if self.watcher.debounce:
-                    if self.timer is not None:
-                        self.timer.cancel()
-                    self.timer = threading.Timer(
-                        self.watcher.debounce, self._refresh
-                    )
-                    self.timer.start()
-                else:
-                    self._refresh()
+        # The modified event sometimes fires twice for no reason; the
+        # debounce coalesces duplicates and the content check in
+        # Watcher.refresh filters no-op rewrites, so no work is done in
+        # the event thread beyond the membership lookup.
+        filename = self.filenames.get(event.src_path)
+        if filename is not None:
+            self.watcher.enqueue(filename)
 
     on_created = on_modified
 
@@ -173,22 +278,16 @@ class JuriggedHandler(FileSystemEventHandler):
         # Watch the directory, because when watching a file, the watcher stops when
         # it is deleted and will not pick back up if the file is recreated. This happens
         # when some editors save.
-        observer.schedule(self, os.path.dirname(self.filename))
-
+        observer.schedule(self, self.directory)
 
-@ovld
-def to_filter(pattern: str):
-    return glob_filter(pattern)
 
-
-@ovld
-def to_filter(patterns: list):
-    return or_filter([to_filter(p) for p in patterns])
-
-
-@ovld
-def to_filter(obj: object):
-    return obj
+def to_filter(pattern):
+    if isinstance(pattern, str):
+        return glob_filter(pattern)
+    elif isinstance(pattern, list):
+        return or_filter([to_filter(p) for p in pattern])
+    else:
+        return pattern
 
 
 def watch(
@@ -1,8 +1,19 @@
 import fnmatch
+import functools
 import os
 import types
 
 
+@functools.lru_cache(maxsize=4096)
+def cached_normpath(path):
+    return os.path.normpath(path)
+
+
+@functools.lru_cache(maxsize=4096)
+def cached_abspath(path):
+    return os.path.abspath(path)
+
+
 class EventSource(list):
     def __init__(self, *, save_history=False):
         if save_history:
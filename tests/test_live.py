@@ -299,6 +299,41 @@ def test_watch_multiple(tmod):
     assert not watcher.observer.is_alive()
 
 
+def test_identical_rewrite(tmod):
+    def lg(evt):
+        evts.append(type(evt).__name__)
+
+    def prerun_test(path, cf):
+        nonlocal preruns
+        preruns += 1
+
+    evts = []
+    preruns = 0
+    mangle = "_12"
+    registry = Registry()
+    watcher = watch(pattern=tmod.rel("*.py"), registry=registry, debounce=0.1)
+    registry.activity.register(lg)
+    watcher.prerun.register(prerun_test)
+
+    za = tmod.imp("za", mangle=mangle)
+    assert za.word == "tyrant"
+
+    tmod.write("za_12.py", 'word = "pirate"\n')
+    time.sleep(0.20)
+    assert za.word == "pirate"
+    updates = evts.count("UpdateOperation")
+    preruns_before = preruns
+
+    # Rewriting identical content should not trigger any refresh
+    tmod.write("za_12.py", 'word = "pirate"\n')
+    time.sleep(0.20)
+    assert evts.count("UpdateOperation") == updates
+    assert preruns == preruns_before
+
+    watcher.stop()
+    watcher.join()
+
+
 def test_to_filter_coverage(tmod):
     def filt(x):
         return x.endswith(".py")